@@ -1,3 +1,4 @@
+import shutil
 from PyQt5 import QtWidgets as qtw
 from PyQt5 import QtCore as qtc
 from PyQt5 import QtGui as qtg
@@ -9,19 +10,23 @@ class LaunchButton(qtw.QPushButton):
     """ This is the actual button you push to launch the program.
     """
 
-    def __init__(self, parent, config):
+    def __init__(self, parent, config, scheduler):
         """Construct a LaunchButton"""
         super().__init__(parent)
         self.config = config
+        self.scheduler = scheduler
         self.setObjectName("LaunchButton")
 
         self.name = self.config.name
         self.comment = self.config.comment
         self.icon = self.config.icon
         self.command = self.config.command
-        self.process = None
-        self.error_log = list()
-        self.output_log = list()
+        self.launch_plan = self.config.launch_plan
+        self.processes = list()
+        # Logs for every process we've created and not yet freed
+        # (including ones that failed to start), keyed by process
+        self.error_log = dict()
+        self.output_log = dict()
 
         # Create the layouts and widgets to hold the information
         toplayout = qtw.QHBoxLayout()
@@ -69,15 +74,47 @@ class LaunchButton(qtw.QPushButton):
         # Connect the callback
         self.clicked.connect(self.callback)
 
+        # A command that didn't compile can never launch
+        if self.launch_plan is None:
+            self.setDisabled(True)
+            self.setToolTip("This launcher's command is not valid.")
+
+    def update_state(self):
+        """Enable or disable the button according to running instances.
+
+        Single-instance launchers stay enabled, since clicking them
+        focuses the running instance instead.
+        """
+        max_instances = 1 if self.config.single_instance else (
+            self.config.max_instances
+        )
+        at_limit = bool(max_instances) and len(self.processes) >= max_instances
+        self.setDisabled(at_limit and not self.config.single_instance)
+
+    def set_queued(self, queued):
+        """Show or clear the "waiting to launch" state.
+
+        Style this with #LaunchButton[queued="true"] in the stylesheet.
+        """
+        self.setProperty('queued', queued)
+        self.setToolTip("Waiting to launch..." if queued else "")
+        # Dynamic properties need a re-polish to update the style
+        self.style().unpolish(self)
+        self.style().polish(self)
+
     def enable(self, exit_code):
-        """Enable the button widget"""
-        self.setDisabled(False)
+        """Forget the finished process and update the button"""
+        self.forget_process(self.sender())
 
     def enable_with_error(self, error_code):
-        """Enable the button, but display an error."""
-        self.setDisabled(False)
-        print(self.error_log)
-        print(self.output_log)
+        """Update the button, but display an error."""
+        process = self.sender()
+        print(self.error_log.get(process))
+        print(self.output_log.get(process))
+        # Some errors (e.g. a failed read) leave the process running;
+        # it will be forgotten when it finishes.
+        if process.state() == qtc.QProcess.NotRunning:
+            self.forget_process(process)
 
         qtw.QMessageBox.critical(
             None,
@@ -85,45 +122,89 @@ class LaunchButton(qtw.QPushButton):
             "Sorry, this program isn't working!"
         )
 
+    def forget_process(self, process):
+        """Drop a process that has stopped, and free it.
+
+        This can be called by both finished and errorOccurred,
+        so make sure the process is only freed once.
+        """
+        if process in self.processes:
+            self.processes.remove(process)
+        if process in self.error_log:
+            del self.error_log[process]
+            del self.output_log[process]
+            process.deleteLater()
+        self.update_state()
+
     def log_error(self):
-        if self.process:
-            error = bytes(self.process.readAllStandardError())
-            self.error_log.append(error.decode('utf-8'))
+        process = self.sender()
+        if process in self.error_log:
+            error = bytes(process.readAllStandardError())
+            self.error_log[process].append(error.decode('utf-8'))
 
     def log_output(self):
-        if self.process:
-            output = bytes(self.process.readAllStandardOutput())
-            self.output_log.append(output.decode('utf-8'))
+        process = self.sender()
+        if process in self.output_log:
+            output = bytes(process.readAllStandardOutput())
+            self.output_log[process].append(output.decode('utf-8'))
+
+    def focus_existing(self):
+        """Try to raise the window of our running instance.
+
+        This needs xdotool; without it we just log and do nothing.
+        """
+        pid = self.processes[0].processId()
+        if not shutil.which('xdotool'):
+            utils.debug(
+                '"{}" is already running (pid {}); install xdotool '
+                'to focus it'.format(self.name, pid)
+            )
+            return
+        qtc.QProcess.startDetached(
+            'xdotool', ['search', '--pid', str(pid), 'windowactivate']
+        )
 
     def callback(self):
         """Run the button's callback function
 
+        The launch is handed to the scheduler, which starts it
+        (by calling launch()) once it is admitted.
+        Single-instance launchers that are already running
+        focus the running instance instead.
+        """
+        if self.config.single_instance and self.processes:
+            self.focus_existing()
+            return
+        self.scheduler.request_launch(self)
+
+    def launch(self):
+        """Start the button's launch plan and return its process
+
         Commands are called in a separate thread using QProcess.
         This way, they can indicate to us when they are finished,
         or if they ran correctly, using signals.
-        XDG commands in desktop files sometimes have placeholder
-        arguments like '%u' or '%f'.
-        We're going to strip these out, because they have no meaning in the
-        context of a button-push.
+        The command was already split into a program and arguments
+        (with XDG field codes expanded) when the config was loaded.
+        Returns None if the process could not be started.
         """
-        self.error_log.clear()
-        self.output_log.clear()
-
-        self.command = ' '.join(
-            x for x in self.command.split()
-            if x not in ('%f', '%F', '%u', '%U')
-        )
-        self.process = qtc.QProcess()
+        process = qtc.QProcess(self)
+        self.error_log[process] = list()
+        self.output_log[process] = list()
         # cannot be a kwarg
-        self.process.setWorkingDirectory(qtc.QDir.homePath())
-        self.process.finished.connect(self.enable)
-        self.process.errorOccurred.connect(self.enable_with_error)
+        process.setWorkingDirectory(
+            self.launch_plan.working_directory or qtc.QDir.homePath()
+        )
+        process.finished.connect(self.enable)
+        process.errorOccurred.connect(self.enable_with_error)
         # This should log standard error and standard output
         # Doesn't always catch stuff though.
-        self.process.readyReadStandardError.connect(self.log_error)
-        self.process.readyReadStandardOutput.connect(self.log_output)
-        self.process.start(self.command)
-        if not self.process.state() == qtc.QProcess.NotRunning:
-            # Disable the button to prevent users clicking
-            # 200 times waiting on a slow program.
-            self.setDisabled(True)
+        process.readyReadStandardError.connect(self.log_error)
+        process.readyReadStandardOutput.connect(self.log_output)
+        process.start(self.launch_plan.program, self.launch_plan.args)
+        if process.state() == qtc.QProcess.NotRunning:
+            return None
+        # Disable the button (if we're at max_instances) to prevent
+        # users clicking 200 times waiting on a slow program.
+        self.processes.append(process)
+        self.update_state()
+        return process
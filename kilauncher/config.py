@@ -1,10 +1,12 @@
 """Configuration object for KiLauncher"""
+import shutil
 from pathlib import Path
 from dataclasses import dataclass
 from PyQt5 import QtGui as qtg
 from xdg.DesktopEntry import DesktopEntry
 
 from . import utils
+from .launchplan import compile_command, unescape_string
 
 
 @dataclass
@@ -18,6 +20,10 @@ class ButtonConfig:
     desktop_file: str = None
     aggressive_icon_search: bool = False
     categories: list = None
+    max_instances: int = 1
+    single_instance: bool = False
+    working_directory: str = None
+    terminal: bool = False
 
     def __str__(self):
         return "ButtonConfig: {}".format(vars(self))
@@ -41,8 +47,38 @@ class ButtonConfig:
                 self.name = de.getName()
                 self.comment = de.getComment()
                 self.icon = de.getIcon()
-                self.command = de.getExec()
+                self.command = unescape_string(de.getExec())
                 self.categories = [c.lower() for c in de.getCategories()]
+                # Path and Terminal only fill in what the config left unset
+                self.working_directory = (
+                    self.working_directory or de.getPath() or None
+                )
+                self.terminal = self.terminal or de.getTerminal()
+
+        self.compile_launch_plan()
+
+    def compile_launch_plan(self):
+        """Compile the command once, so problems show up at load time."""
+        self.launch_plan = None
+        try:
+            self.launch_plan = compile_command(
+                self.command,
+                name=self.name,
+                icon=self.icon,
+                desktop_file=self.desktop_file,
+                working_directory=self.working_directory,
+                terminal=self.terminal
+            )
+        except ValueError as e:
+            utils.debug(
+                'Launcher "{}" will be disabled: {}'.format(self.name, e)
+            )
+            return
+        if not shutil.which(self.launch_plan.program):
+            utils.debug(
+                'Warning: launcher "{}" runs "{}", which could not be found.'
+                .format(self.name, self.launch_plan.program)
+            )
 
 
 @dataclass
@@ -172,6 +208,18 @@ class KiLauncherConfig:
         },
         "autostart": {
             "default": []
+        },
+        "max_concurrent_launches": {
+            "default": 0,
+            "transform": int
+        },
+        "launch_settle_time": {
+            "default": 5,
+            "transform": float
+        },
+        "min_free_memory": {
+            "default": 0,
+            "transform": int
         }
     }
 
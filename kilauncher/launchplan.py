@@ -0,0 +1,202 @@
+"""Compile launcher commands into ready-to-run argument lists
+
+Commands are parsed according to the Exec key rules of the
+XDG Desktop Entry specification, see
+https://specifications.freedesktop.org/desktop-entry-spec/latest/exec-variables.html
+"""
+import re
+import shutil
+from dataclasses import dataclass, field
+
+# Terminals to try (in order) for launchers with Terminal=true
+TERMINALS = ('x-terminal-emulator', 'xterm')
+
+# Characters which can be backslash-escaped inside a quoted argument
+QUOTE_ESCAPES = '"`$\\'
+
+# Field codes that expand to nothing when launched from a button
+# (we never have files or URLs to pass), plus the deprecated ones.
+EMPTY_FIELD_CODES = 'fFuUdDnNvm'
+
+# Escapes in desktop file string values, undone before Exec quoting
+STRING_ESCAPES = {'s': ' ', 'n': '\n', 't': '\t', 'r': '\r', '\\': '\\'}
+
+field_code_re = re.compile(r'%(.?)', re.DOTALL)
+string_escape_re = re.compile(r'\\(.)', re.DOTALL)
+
+
+@dataclass
+class LaunchPlan:
+    program: str
+    args: list = field(default_factory=list)
+    working_directory: str = None
+
+
+def unescape_string(value):
+    r"""Undo the string-level escapes of a desktop file value.
+
+    pyxdg returns values raw, but the spec applies these escapes
+    before the Exec quoting rules.  YAML commands aren't escaped
+    this way, so only use this on values read from desktop files.
+
+    >>> compile_command(unescape_string(r'sh -c "echo \\"hi\\""')).args
+    ['-c', 'echo "hi"']
+    >>> compile_command(
+    ...     unescape_string(r'wine "C:\\\\windows\\\\start.exe"')).args
+    ['C:\\windows\\start.exe']
+    >>> unescape_string(r'a\sb\tc\q')
+    'a b\tc\\q'
+    """
+    return string_escape_re.sub(
+        lambda match: STRING_ESCAPES.get(match.group(1), match.group(0)),
+        value
+    )
+
+
+def split_exec(command):
+    """Split an Exec string into arguments.
+
+    Each argument is a list of (text, quoted) segments, so that field
+    codes can later be expanded in the unquoted parts only.
+    """
+    arguments = list()
+    current = None
+    i = 0
+    while i < len(command):
+        char = command[i]
+        if char.isspace():
+            if current is not None:
+                arguments.append(current)
+                current = None
+            i += 1
+            continue
+        if current is None:
+            current = list()
+        if char == '"':
+            text = ''
+            i += 1
+            while True:
+                if i >= len(command):
+                    raise ValueError(
+                        f'Unterminated quote in command: {command}')
+                char = command[i]
+                if (
+                        char == '\\'
+                        and i + 1 < len(command)
+                        and command[i+1] in QUOTE_ESCAPES
+                ):
+                    text += command[i+1]
+                    i += 2
+                elif char == '"':
+                    i += 1
+                    break
+                else:
+                    text += char
+                    i += 1
+            current.append((text, True))
+        else:
+            start = i
+            while (
+                    i < len(command)
+                    and not command[i].isspace()
+                    and command[i] != '"'
+            ):
+                i += 1
+            current.append((command[start:i], False))
+    if current is not None:
+        arguments.append(current)
+    return arguments
+
+
+def expand_field_codes(text, name, desktop_file, command):
+    """Expand the field codes in an unquoted piece of an argument"""
+
+    def expand(match):
+        code = match.group(1)
+        if not code:
+            raise ValueError(
+                f'Dangling "%" in command (use "%%" for a literal "%"): '
+                f'{command}'
+            )
+        if code == '%':
+            return '%'
+        if code in EMPTY_FIELD_CODES or code == 'i':
+            return ''
+        if code == 'c':
+            return name or ''
+        if code == 'k':
+            return str(desktop_file or '')
+        raise ValueError(
+            f'Unknown field code "%{code}" in command: {command}')
+
+    return field_code_re.sub(expand, text)
+
+
+def find_terminal():
+    for terminal in TERMINALS:
+        if shutil.which(terminal):
+            return terminal
+    return TERMINALS[-1]
+
+
+def compile_command(
+        command,
+        name=None,
+        icon=None,
+        desktop_file=None,
+        working_directory=None,
+        terminal=False
+):
+    r"""Turn a command string into a LaunchPlan.
+
+    Raises ValueError if the command can't be understood.
+
+    >>> plan = compile_command('"/opt/my app/run" "say \\"hi\\"" %U 100%%')
+    >>> plan.program, plan.args
+    ('/opt/my app/run', ['say "hi"', '100%'])
+    >>> compile_command('gimp %i --name=%c %f', name='GIMP', icon='gimp').args
+    ['--icon', 'gimp', '--name=GIMP']
+    >>> compile_command('foo %i').args
+    []
+    >>> compile_command('foo 100%')
+    Traceback (most recent call last):
+    ...
+    ValueError: Dangling "%" in command (use "%%" for a literal "%"): foo 100%
+    >>> compile_command('foo "bar')
+    Traceback (most recent call last):
+    ...
+    ValueError: Unterminated quote in command: foo "bar
+    >>> compile_command('foo "bar\\')
+    Traceback (most recent call last):
+    ...
+    ValueError: Unterminated quote in command: foo "bar\
+    """
+    argv = list()
+    for argument in split_exec(command or ''):
+        # %i is only valid as a whole argument, and becomes two
+        if argument == [('%i', False)]:
+            if icon:
+                argv.extend(['--icon', str(icon)])
+            continue
+        has_field_codes = False
+        value = ''
+        for text, quoted in argument:
+            if not quoted:
+                has_field_codes |= '%' in text
+                text = expand_field_codes(text, name, desktop_file, command)
+            value += text
+        # Drop arguments that were nothing but (now empty) field codes
+        if value or not has_field_codes:
+            argv.append(value)
+
+    if not argv or not argv[0]:
+        raise ValueError(f'No program to run in command: {command!r}')
+    if terminal:
+        argv = [find_terminal(), '-e'] + argv
+    return LaunchPlan(
+        program=argv[0],
+        args=argv[1:],
+        working_directory=(
+            str(working_directory) if working_directory else None
+        )
+    )
@@ -0,0 +1,46 @@
+"""Read system memory for launch admission
+
+Kept free of Qt so it can be checked with
+python -m doctest kilauncher/memory.py
+"""
+
+
+def available_memory(meminfo_path='/proc/meminfo'):
+    """Return the available system memory in MiB, or None if unknown.
+
+    Reads MemAvailable from /proc/meminfo, falling back to MemFree
+    on kernels too old to report it.
+
+    >>> import os, tempfile
+    >>> def meminfo(text):
+    ...     with tempfile.NamedTemporaryFile('w', delete=False) as f:
+    ...         f.write(text)
+    ...     try:
+    ...         return available_memory(f.name)
+    ...     finally:
+    ...         os.remove(f.name)
+    >>> meminfo(
+    ...     'MemTotal:  2048000 kB\\n'
+    ...     'MemFree:    102400 kB\\n'
+    ...     'MemAvailable: 512000 kB\\n'
+    ... )
+    500
+    >>> meminfo('MemTotal:  2048000 kB\\nMemFree:    102400 kB\\n')
+    100
+    >>> meminfo('MemTotal:  2048000 kB\\n') is None
+    True
+    >>> available_memory('/nonexistent/meminfo') is None
+    True
+    """
+    values = dict()
+    try:
+        with open(meminfo_path, 'r') as meminfo:
+            for line in meminfo:
+                key, _, value = line.partition(':')
+                values[key.strip()] = value.split()
+    except OSError:
+        return None
+    for key in ('MemAvailable', 'MemFree'):
+        if values.get(key):
+            return int(values[key][0]) // 1024
+    return None
@@ -6,9 +6,10 @@ from .button import LaunchButton
 
 class LauncherMenu(qtw.QWidget):
     """A single pane of launchers on a tab"""
-    def __init__(self, config, parent=None):
+    def __init__(self, config, scheduler, parent=None):
         super().__init__(parent)
         self.config = config
+        self.scheduler = scheduler
         self.launcherlayout = qtw.QGridLayout()
         self.layout = qtw.QVBoxLayout()
         # Show the description
@@ -46,7 +47,7 @@ class LauncherMenu(qtw.QWidget):
         self.columns = self.config.launchers_per_row
         self.current_coordinates = [0, 0]
         for launcher in self.config.launchers:
-            b = LaunchButton(self, launcher)
+            b = LaunchButton(self, launcher, self.scheduler)
             self.add_launcher_to_layout(b)
         self.scroller.setWidget(self.launcher_widget)
 
@@ -0,0 +1,96 @@
+from collections import deque
+from PyQt5 import QtCore as qtc
+
+from . import utils
+from .memory import available_memory
+
+
+class LaunchScheduler(qtc.QObject):
+    """Decides when a requested launch may actually start.
+
+    Buttons don't start their own processes; they ask the scheduler,
+    which queues the request until it is admitted.  A launch is admitted
+    when fewer than max_concurrent_launches launches are still in progress,
+    and there is at least min_free_memory MiB of memory available.
+    A launch stops being "in progress" when its process exits, or
+    after launch_settle_time seconds, whichever comes first.
+    A launch that has just started hasn't used its memory yet, so when
+    min_free_memory is set, memory is only checked once every launch
+    in progress has settled.
+    """
+
+    # How often (ms) to re-check memory when a launch is waiting on it
+    memory_poll_interval = 1000
+
+    def __init__(self, config, parent=None):
+        super().__init__(parent)
+        self.max_concurrent_launches = config.max_concurrent_launches
+        self.launch_settle_time = config.launch_settle_time
+        self.min_free_memory = config.min_free_memory
+        self.queue = deque()
+        self.in_progress = set()
+
+        self.memory_timer = qtc.QTimer(self)
+        self.memory_timer.setInterval(self.memory_poll_interval)
+        self.memory_timer.timeout.connect(self.dispatch)
+
+    def request_launch(self, button):
+        """Queue a launch for the button and start it if we can."""
+        if button in self.queue:
+            return
+        self.queue.append(button)
+        button.set_queued(True)
+        self.dispatch()
+
+    def has_free_slot(self):
+        return (
+            not self.max_concurrent_launches
+            or len(self.in_progress) < self.max_concurrent_launches
+        )
+
+    def waiting_to_settle(self):
+        """Whether a memory reading would miss launches still starting."""
+        return bool(self.min_free_memory and self.in_progress)
+
+    def has_free_memory(self):
+        if not self.min_free_memory:
+            return True
+        available = available_memory()
+        # If we can't tell, don't hold anything back.
+        return available is None or available >= self.min_free_memory
+
+    def dispatch(self):
+        """Start as many queued launches as are currently admissible."""
+        held_for_memory = self.memory_timer.isActive()
+        self.memory_timer.stop()
+        while self.queue:
+            if not self.has_free_slot() or self.waiting_to_settle():
+                # We'll be called again when a launch settles
+                return
+            if not self.has_free_memory():
+                # Only log when the hold starts, not on every poll
+                if not held_for_memory:
+                    utils.debug(
+                        "Low memory; holding {} queued launch(es)"
+                        .format(len(self.queue))
+                    )
+                self.memory_timer.start()
+                return
+            button = self.queue.popleft()
+            button.set_queued(False)
+            process = button.launch()
+            if process is None:
+                continue
+            self.in_progress.add(process)
+            process.finished.connect(lambda *_, p=process: self.settle(p))
+            process.errorOccurred.connect(lambda *_, p=process: self.settle(p))
+            qtc.QTimer.singleShot(
+                int(self.launch_settle_time * 1000),
+                lambda p=process: self.settle(p)
+            )
+
+    def settle(self, process):
+        """Mark a launch as no longer in progress."""
+        if process in self.in_progress:
+            self.in_progress.discard(process)
+            self.dispatch()
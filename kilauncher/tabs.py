@@ -5,6 +5,7 @@ from PyQt5 import QtGui as qtg
 
 from . import utils
 from .menu import LauncherMenu
+from .scheduler import LaunchScheduler
 
 
 class KiLauncherTabs(qtw.QTabWidget):
@@ -39,6 +40,9 @@ class KiLauncherTabs(qtw.QTabWidget):
         if self.config.icon_theme:
             qtg.QIcon.setThemeName(self.config.icon_theme)
 
+        # All launch buttons share one scheduler
+        self.scheduler = LaunchScheduler(self.config, self)
+
         # Set up the tabs
         if self.config.tabs_and_launchers:
             self.init_tabs()
@@ -92,7 +96,7 @@ class KiLauncherTabs(qtw.QTabWidget):
     def init_tabs(self):
         """Populate each tab with a LauncherPane of Launchers."""
         for tabordinal, launchers in enumerate(self.config.tabs_and_launchers):
-            lm = LauncherMenu(launchers)
+            lm = LauncherMenu(launchers, self.scheduler)
             launcher_name = launchers.name
             if launchers.icon:
                 icon = utils.icon_anyway_you_can(launchers.icon, False)
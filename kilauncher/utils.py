@@ -89,3 +89,4 @@ def icon_anyway_you_can(icon_name, recursive_search=True):
         if not icon:
             debug("Couldn't find an icon for \"{}\".".format(icon_name))
     return icon or qtg.QIcon()
+